@@ -0,0 +1,60 @@
+from pyspark.sql import SparkSession
+from pyspark.sql.types import (
+    StructType, StructField, IntegerType, StringType, DoubleType, TimestampType, BooleanType
+)
+
+# ========================
+# Conversão única: CSV -> Parquet
+# ========================
+# Parquet é colunar e comprimido: permite que o example.py leia apenas as
+# colunas usadas e empurre os filtros (status, ativo) para as estatísticas
+# dos row groups, em vez de reprocessar o CSV inteiro a cada execução.
+
+spark = SparkSession.builder \
+    .appName("Conversao_Parquet") \
+    .getOrCreate()
+
+# Schemas explícitos evitam a passada extra de inferSchema sobre cada CSV.
+# enforceSchema=False faz o Spark validar o cabeçalho contra o schema (pelo nome),
+# em vez de mapear as colunas só pela posição
+clientes_schema = StructType([
+    StructField("id_cliente", IntegerType()),
+    StructField("nome", StringType()),
+    StructField("id_endereco", IntegerType())
+])
+enderecos_schema = StructType([
+    StructField("id_endereco", IntegerType()),
+    StructField("cidade", StringType()),
+    StructField("estado", StringType())
+])
+pedidos_schema = StructType([
+    StructField("id_pedido", IntegerType()),
+    StructField("id_cliente", IntegerType()),
+    StructField("data_pedido", TimestampType()),
+    StructField("status", StringType())
+])
+itens_schema = StructType([
+    StructField("id_pedido", IntegerType()),
+    StructField("id_produto", IntegerType()),
+    StructField("quantidade", IntegerType())
+])
+produtos_schema = StructType([
+    StructField("id_produto", IntegerType()),
+    StructField("descricao", StringType()),
+    StructField("preco", DoubleType()),
+    StructField("ativo", BooleanType())
+])
+
+fontes = {
+    "clientes": ("data/clientes.csv", clientes_schema),
+    "enderecos": ("data/enderecos.csv", enderecos_schema),
+    "pedidos": ("data/pedidos.csv", pedidos_schema),
+    "itens_pedido": ("data/itens_pedido.csv", itens_schema),
+    "produtos": ("data/produtos.csv", produtos_schema),
+}
+
+for tabela, (csv_path, schema) in fontes.items():
+    spark.read.csv(csv_path, header=True, schema=schema, enforceSchema=False) \
+        .write.mode("overwrite").parquet(f"data/parquet/{tabela}")
+
+spark.stop()
@@ -1,38 +1,48 @@
 from pyspark.sql import SparkSession
-from pyspark.sql.functions import col, upper, trim, when, round
+from pyspark.sql.functions import col, upper, trim, when, round, broadcast
 
 # ========================
 # 1. Inicialização
 # ========================
 spark = SparkSession.builder \
     .appName("ETL_Vendas") \
+    .config("spark.sql.autoBroadcastJoinThreshold", 256 * 1024 * 1024) \
+    .config("spark.sql.adaptive.enabled", "true") \
+    .config("spark.sql.adaptive.skewJoin.enabled", "true") \
+    .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
+    .config("spark.sql.adaptive.skewJoin.skewedPartitionFactor", "5") \
+    .config("spark.sql.adaptive.advisoryPartitionSizeInBytes", "64m") \
     .getOrCreate()
 
 # ========================
 # 2. Extração - Carregando tabelas
 # ========================
-clientes_df = spark.read.csv("data/clientes.csv", header=True, inferSchema=True)
-enderecos_df = spark.read.csv("data/enderecos.csv", header=True, inferSchema=True)
-pedidos_df = spark.read.csv("data/pedidos.csv", header=True, inferSchema=True)
-itens_df = spark.read.csv("data/itens_pedido.csv", header=True, inferSchema=True)
-produtos_df = spark.read.csv("data/produtos.csv", header=True, inferSchema=True)
+
+# Fontes em Parquet (geradas por convert_to_parquet.py)
+clientes_df = spark.read.parquet("data/parquet/clientes")
+enderecos_df = spark.read.parquet("data/parquet/enderecos")
+pedidos_df = spark.read.parquet("data/parquet/pedidos")
+itens_df = spark.read.parquet("data/parquet/itens_pedido")
+produtos_df = spark.read.parquet("data/parquet/produtos")
 
 # ========================
 # 3. Transformação
 # ========================
 
 # --- Normalizações e Limpeza ---
-clientes_df = clientes_df.withColumn("nome", trim(upper(col("nome"))))
+clientes_df = clientes_df.withColumn("nome", upper(trim(col("nome"))))
 enderecos_df = enderecos_df.withColumn("cidade", upper(trim(col("cidade"))))
 produtos_df = produtos_df.withColumn("preco", round(col("preco"), 2))
 
-# --- Filtros simples ---
-pedidos_df = pedidos_df.filter(col("status") == "FINALIZADO")
-produtos_df = produtos_df.filter(col("ativo") == True)
+# --- Filtros simples (com poda das colunas que não seguem para os joins) ---
+pedidos_df = pedidos_df.filter(col("status") == "FINALIZADO").select("id_pedido", "id_cliente", "data_pedido")
+produtos_df = produtos_df.filter(col("ativo") == True).select("id_produto", "descricao", "preco")
+itens_df = itens_df.select("id_pedido", "id_produto", "quantidade")
 
 # --- Enriquecimento (join 1: cliente + endereço) ---
+# Dimensões pequenas vão em broadcast para evitar shuffle das tabelas fato
 cliente_endereco_df = clientes_df.join(
-    enderecos_df,
+    broadcast(enderecos_df),
     clientes_df["id_endereco"] == enderecos_df["id_endereco"],
     "left"
 ).select(
@@ -44,13 +54,13 @@ cliente_endereco_df = clientes_df.join(
 
 # --- Join 2: pedidos com cliente_endereco ---
 pedidos_clientes_df = pedidos_df.join(
-    cliente_endereco_df,
+    broadcast(cliente_endereco_df),
     "id_cliente"
 )
 
 # --- Join 3: itens + produtos ---
 itens_produtos_df = itens_df.join(
-    produtos_df,
+    broadcast(produtos_df),
     "id_produto"
 ).select(
     "id_pedido",
@@ -87,10 +97,14 @@ vendas_por_cidade = fato_vendas_df.groupBy("cidade").sum("valor_total_item") \
 
 # Escreve em Parquet 
 # Opcional: salvar no banco
+# Inserts em lote: reWriteBatchedInserts faz o driver do Postgres juntar cada
+# lote de `batchsize` linhas em um único INSERT multi-valores
 vendas_por_cidade.write \
      .format("jdbc") \
-     .option("url", "jdbc:postgresql://localhost:5432/db_vendas") \
+     .option("url", "jdbc:postgresql://localhost:5432/db_vendas?reWriteBatchedInserts=true") \
      .option("dbtable", "vw_vendas_cidade") \
+     .option("batchsize", 10000) \
+     .option("numPartitions", 8) \
      .option("user", "user") \
      .option("password", "senha") \
      .save()
@@ -0,0 +1,28 @@
+import duckdb
+
+# ========================
+# Versão single-node do ETL_Vendas (DuckDB)
+# ========================
+# Quando as fontes cabem na memória de uma máquina, o overhead do Spark
+# (driver, shuffles, serialização JVM) domina. O DuckDB executa os mesmos
+# joins + groupBy em um único processo, com engine colunar vetorizada.
+# Mesma lógica de example.py, lendo o Parquet gerado por convert_to_parquet.py.
+
+con = duckdb.connect()
+
+con.execute("""
+    COPY (
+        SELECT
+            upper(trim(e.cidade)) AS cidade,
+            SUM(i.quantidade * round(pr.preco, 2)) AS valor_total_vendas
+        FROM 'data/parquet/pedidos/*.parquet' p
+        JOIN 'data/parquet/clientes/*.parquet' c USING (id_cliente)
+        LEFT JOIN 'data/parquet/enderecos/*.parquet' e USING (id_endereco)
+        JOIN 'data/parquet/itens_pedido/*.parquet' i USING (id_pedido)
+        JOIN 'data/parquet/produtos/*.parquet' pr USING (id_produto)
+        WHERE p.status = 'FINALIZADO' AND pr.ativo = true
+        GROUP BY 1
+    ) TO 'data/parquet/vw_vendas_cidade.parquet' (FORMAT PARQUET)
+""")
+
+con.close()
@@ -6,6 +6,9 @@ Gera um grafo interativo HTML (pyvis) de data lineage a partir de um CSV de mape
 
 CSV esperado (colunas): "Tabela Final", "DataFrame", "Origem", "Transformação"
 - Origem pode ser uma lista separada por vírgula (ex: "clientes_df, enderecos_df" ou "data/clientes.csv")
+
+Layout: as posições são calculadas com networkx.spring_layout, que a partir de 500 nós
+precisa de scipy. Sem scipy, grafos grandes usam um layout em camadas pela ordem topológica.
 """
 
 import pandas as pd
@@ -15,9 +18,8 @@ from pathlib import Path
 import argparse
 
 def split_origins(orig):
-    if pd.isna(orig):
-        return []
-    parts = [p.strip() for p in str(orig).split(",") if p.strip() and p.strip() != "—"]
+    # espera valores já sem NaN (build_graph_from_csv faz fillna("") na leitura)
+    parts = [s for s in (p.strip() for p in str(orig).split(",")) if s and s != "—"]
     return parts
 
 def node_type_heuristic(name, final_table):
@@ -56,14 +58,20 @@ def build_graph_from_csv(csv_path):
         if c not in df.columns:
             df[c] = ""
 
+    # células vazias viram "" uma única vez, em vez de checar NaN linha a linha
+    df = df.fillna("")
+
     G = nx.DiGraph()
 
-    for _, row in df.iterrows():
-        final_table = str(row.get("Tabela Final", "")).strip() or None
-        df_name = str(row.get("DataFrame", "")).strip() or None
-        transform = str(row.get("Transformação", "")).strip()
-        origem = row.get("Origem", "")
-        origins = split_origins(origem)
+    # normaliza as colunas de uma vez e percorre com zip (evita montar uma Series por linha)
+    final_tables = df["Tabela Final"].astype(str).str.strip()
+    df_names = df["DataFrame"].astype(str).str.strip()
+    transforms = df["Transformação"].astype(str).str.strip()
+    origins_col = df["Origem"].map(split_origins)
+
+    for final_table, df_name, transform, origins in zip(final_tables, df_names, transforms, origins_col):
+        final_table = final_table or None
+        df_name = df_name or None
 
         # adiciona nós e arestas origem -> df_name
         for origin in origins:
@@ -84,9 +92,24 @@ def build_graph_from_csv(csv_path):
 
     return G
 
+def compute_layout(G):
+    # spring_layout usa matriz esparsa do scipy a partir de 500 nós; sem scipy,
+    # cai para um layout em camadas (lineage costuma ser um DAG), só com numpy
+    try:
+        return nx.spring_layout(G, seed=42)
+    except ImportError:
+        if not nx.is_directed_acyclic_graph(G):
+            return nx.circular_layout(G)
+        layers = nx.Graph()
+        for i, nodes in enumerate(nx.topological_generations(G)):
+            layers.add_nodes_from(nodes, layer=i)
+        return nx.multipartite_layout(layers, subset_key="layer")
+
 def render_pyvis(G, output_html, notebook_mode=False, height="800px", width="100%"):
     net = Network(directed=True, height=height, width=width, notebook=notebook_mode)
-    net.force_atlas_2based()
+
+    # layout calculado uma vez no Python; o navegador só desenha (sem simulação de física)
+    pos = compute_layout(G)
 
     type_style = {
         "file": {"color": "#f4a261", "shape": "box"},
@@ -95,22 +118,35 @@ def render_pyvis(G, output_html, notebook_mode=False, height="800px", width="100
         "final_table": {"color": "#e76f51", "shape": "diamond"}
     }
 
+    # monta as listas do pyvis numa única passada, já com o estilo final
+    # (add_node/add_edge varrem node_ids a cada chamada: O(N) por nó/aresta)
     for n, attrs in G.nodes(data=True):
         ntype = attrs.get("type", "dataframe")
         style = type_style.get(ntype, {"color": "#888", "shape": "dot"})
         in_deg = G.in_degree(n)
         out_deg = G.out_degree(n)
-        title = f"<b>{n}</b><br>Type: {ntype}<br>In: {in_deg} | Out: {out_deg}"
-        net.add_node(n, label=n, title=title, color=style["color"], shape=style["shape"])
+        node = {
+            "id": n,
+            "label": n,
+            "title": f"<b>{n}</b><br>Type: {ntype}<br>In: {in_deg} | Out: {out_deg}",
+            "color": style["color"],
+            "shape": style["shape"],
+            "x": float(pos[n][0]) * 1000,
+            "y": float(pos[n][1]) * 1000,
+            "physics": False,
+        }
+        net.nodes.append(node)
+        net.node_ids.append(n)
+        net.node_map[n] = node
 
     for u, v, attrs in G.edges(data=True):
         lbl = attrs.get("label", "")
-        net.add_edge(u, v, title=lbl, label=lbl, arrows="to")
+        net.edges.append({"from": u, "to": v, "title": lbl, "label": lbl, "arrows": "to"})
 
     # opções de física/layout
     net.set_options("""
     var options = {
-      "physics": {"forceAtlas2Based": {"gravitationalConstant": -50, "springLength": 100}, "solver": "forceAtlas2Based"},
+      "physics": { "enabled": false },
       "manipulation": { "enabled": false }
     }
     """)